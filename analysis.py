@@ -18,12 +18,21 @@ from __future__ import annotations
 
 import argparse
 import csv
+import itertools
 import sqlite3
 import sys
 from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 DB_DEFAULT = "games.sqlite"
 
+# Per-player columns in schema order (level, score, gradingScore, rank for player1..player4)
+PLAYER_COLUMNS = ", ".join(
+    f"player{i}_level, player{i}_score, player{i}_gradingScore, player{i}_rank" for i in range(1, 5)
+)
+
+# Rows pulled per fetchmany call when streaming large result sets
+FETCH_BATCH_SIZE = 10000
+
 
 def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Mahjong Soul analysis")
@@ -74,225 +83,241 @@ def where_clause(args: argparse.Namespace) -> Tuple[str, List[Any]]:
     return where, params
 
 
-def iter_player_rows(conn: sqlite3.Connection, args: argparse.Namespace) -> Iterable[Tuple[int, int, int, int]]:
+def fetch_batches(conn: sqlite3.Connection, sql: str, params: List[Any]) -> Iterable[List[Tuple[Any, ...]]]:
+    """Yield query results in lists of FETCH_BATCH_SIZE rows via fetchmany."""
+    cur = conn.execute(sql, params)
+    cur.arraysize = FETCH_BATCH_SIZE
+    while True:
+        rows = cur.fetchmany()
+        if not rows:
+            break
+        yield rows
+
+
+def player_rows_sql() -> str:
     """
-    Yield normalized rows (rank, level, score, grade) for all four players.
+    Build a UNION ALL over the four player slots, exposing one row per player as
+    (id, mode, startTime, player, rank, level, score, grade). Backs the v_players view.
     """
-    where, params = where_clause(args)
-    sql = (
-        "SELECT player1_rank, player1_level, player1_score, player1_gradingScore, "
-        "player2_rank, player2_level, player2_score, player2_gradingScore, "
-        "player3_rank, player3_level, player3_score, player3_gradingScore, "
-        "player4_rank, player4_level, player4_score, player4_gradingScore "
-        "FROM games" + where
+    return " UNION ALL ".join(
+        f"SELECT id, mode, startTime, {i} AS player, player{i}_rank AS rank, player{i}_level AS level, "
+        f"player{i}_score AS score, player{i}_gradingScore AS grade FROM games"
+        for i in range(1, 5)
     )
-    for row in conn.execute(sql, params):
-        # row: 16 columns
-        for i in range(4):
-            rank = row[i * 4]
-            level = row[i * 4 + 1]
-            score = row[i * 4 + 2]
-            grade = row[i * 4 + 3]
-            yield int(rank), int(level), int(score), int(grade)
 
 
-def bucket_level(level: int, mode: str) -> int:
+def create_views(conn: sqlite3.Connection) -> None:
+    """Create the connection-local views shared by the subcommands."""
+    conn.executescript("CREATE TEMP VIEW IF NOT EXISTS v_players AS " + player_rows_sql() + ";")
+
+
+def bucket_sql(mode: str, column: str = "level") -> str:
+    """SQL expression bucketing a level column: exact level, or by 10s for level10."""
     if mode == "level10":
-        return (level // 10) * 10
-    return level
+        return f"({column} / 10) * 10"
+    return column
 
 
-def do_rank_correlation(conn: sqlite3.Connection, args: argparse.Namespace) -> None:
-    from collections import defaultdict
-
-    # Aggregates per level bucket
-    counts = defaultdict(int)
-    place1 = defaultdict(int)
-    place2 = defaultdict(int)
-    place3 = defaultdict(int)
-    place4 = defaultdict(int)
-    sum_score = defaultdict(int)
-    sum_grade = defaultdict(int)
-    sum_place = defaultdict(int)
-
-    total = 0
-    for rank, level, score, grade in iter_player_rows(conn, args):
-        lb = bucket_level(level, args.level_bin)
-        counts[lb] += 1
-        if rank == 1:
-            place1[lb] += 1
-        elif rank == 2:
-            place2[lb] += 1
-        elif rank == 3:
-            place3[lb] += 1
-        elif rank == 4:
-            place4[lb] += 1
-        sum_score[lb] += score
-        sum_grade[lb] += grade
-        sum_place[lb] += rank
-        total += 1
+def player_pairs_sql(level_bin: str) -> str:
+    """
+    Build a UNION ALL over every ordered pair of distinct player slots in a game,
+    exposing (mode, startTime, bucket_a, bucket_b, diff_rank, diff_score, diff_grade).
+    """
+    parts = []
+    for i in range(1, 5):
+        for j in range(1, 5):
+            if i == j:
+                continue
+            parts.append(
+                f"SELECT mode, startTime, "
+                f"{bucket_sql(level_bin, f'player{i}_level')} AS bucket_a, "
+                f"{bucket_sql(level_bin, f'player{j}_level')} AS bucket_b, "
+                f"player{i}_rank - player{j}_rank AS diff_rank, "
+                f"player{i}_score - player{j}_score AS diff_score, "
+                f"player{i}_gradingScore - player{j}_gradingScore AS diff_grade "
+                f"FROM games"
+            )
+    return " UNION ALL ".join(parts)
 
-    if total == 0:
-        print("No rows match the filter.")
-        return
 
-    # Header
-    print("level,count,p1%,p2%,p3%,p4%,avg_place,avg_score,avg_grade")
-    for lb in sorted(counts.keys()):
-        c = counts[lb]
-        p1 = place1[lb] / c * 100.0
-        p2 = place2[lb] / c * 100.0
-        p3 = place3[lb] / c * 100.0
-        p4 = place4[lb] / c * 100.0
-        avg_place = sum_place[lb] / c
-        avg_score = sum_score[lb] / c
-        avg_grade = sum_grade[lb] / c
-        print(f"{lb},{c},{p1:.2f},{p2:.2f},{p3:.2f},{p4:.2f},{avg_place:.3f},{avg_score:.2f},{avg_grade:.2f}")
+def do_rank_correlation(conn: sqlite3.Connection, args: argparse.Namespace) -> None:
+    where, params = where_clause(args)
+    sql = (
+        "SELECT " + bucket_sql(args.level_bin) + " AS bucket, COUNT(*), "
+        "SUM(CASE WHEN rank = 1 THEN 1 ELSE 0 END), "
+        "SUM(CASE WHEN rank = 2 THEN 1 ELSE 0 END), "
+        "SUM(CASE WHEN rank = 3 THEN 1 ELSE 0 END), "
+        "SUM(CASE WHEN rank = 4 THEN 1 ELSE 0 END), "
+        "SUM(rank), SUM(score), SUM(grade) "
+        "FROM v_players" + where + " GROUP BY bucket ORDER BY bucket"
+    )
 
+    header_printed = False
+    for lb, c, place1, place2, place3, place4, sum_place, sum_score, sum_grade in conn.execute(sql, params):
+        if not header_printed:
+            print("level,count,p1%,p2%,p3%,p4%,avg_place,avg_score,avg_grade")
+            header_printed = True
+        p1 = place1 / c * 100.0
+        p2 = place2 / c * 100.0
+        p3 = place3 / c * 100.0
+        p4 = place4 / c * 100.0
+        avg_place = sum_place / c
+        avg_score = sum_score / c
+        avg_grade = sum_grade / c
+        print(f"{lb},{c},{p1:.2f},{p2:.2f},{p3:.2f},{p4:.2f},{avg_place:.3f},{avg_score:.2f},{avg_grade:.2f}")
 
-def do_summary(conn: sqlite3.Connection, args: argparse.Namespace) -> None:
-    from collections import defaultdict
+    if not header_printed:
+        print("No rows match the filter.")
 
-    counts = defaultdict(int)
-    sum_score = defaultdict(int)
-    sum_grade = defaultdict(int)
-    sum_level = defaultdict(int)
 
-    total = 0
-    for rank, level, score, grade in iter_player_rows(conn, args):
-        counts[rank] += 1
-        sum_score[rank] += score
-        sum_grade[rank] += grade
-        sum_level[rank] += level
-        total += 1
+def do_summary(conn: sqlite3.Connection, args: argparse.Namespace) -> None:
+    where, params = where_clause(args)
+    sql = (
+        "SELECT rank, COUNT(*), SUM(score), SUM(grade), SUM(level) "
+        "FROM v_players" + where + " GROUP BY rank ORDER BY rank"
+    )
+    rows = conn.execute(sql, params).fetchall()
 
+    total = sum(row[1] for row in rows)
     if total == 0:
         print("No rows match the filter.")
         return
 
     print("rank,count,percent,avg_score,avg_grade,avg_level")
-    for rank in sorted(counts.keys()):
-        c = counts[rank]
+    for rank, c, sum_score, sum_grade, sum_level in rows:
         pct = (c / total) * 100.0
-        avg_score = sum_score[rank] / c
-        avg_grade = sum_grade[rank] / c
-        avg_level = sum_level[rank] / c
+        avg_score = sum_score / c
+        avg_grade = sum_grade / c
+        avg_level = sum_level / c
         print(f"{rank},{c},{pct:.2f},{avg_score:.2f},{avg_grade:.2f},{avg_level:.2f}")
 
 
+def csv_field_sql(column: str) -> str:
+    """SQL expression rendering a TEXT column as a CSV field, quoted like csv.writer does."""
+    return (
+        f"CASE WHEN {column} GLOB '*[\",' || char(13) || char(10) || ']*' "
+        f"THEN '\"' || replace({column}, '\"', '\"\"') || '\"' ELSE {column} END"
+    )
+
+
 def do_export(conn: sqlite3.Connection, args: argparse.Namespace) -> None:
     where, params = where_clause(args)
+    # Format each game's 4 normalized player rows as CSV text inside SQLite,
+    # matching csv.writer's default dialect (\r\n line endings)
+    line_fmt = "%s,%s,%s,{player},%s,%s,%s,%s\r\n"
+    fmt_args: List[str] = []
+    for i in range(1, 5):
+        # (id, mode, startTime, player, rank, level, score, grade)
+        fmt_args += [
+            csv_field_sql("id"), "mode", "startTime",
+            f"player{i}_rank", f"player{i}_level", f"player{i}_score", f"player{i}_gradingScore",
+        ]
     sql = (
-        "SELECT id, mode, startTime, "
-        "player1_level, player1_score, player1_gradingScore, player1_rank, "
-        "player2_level, player2_score, player2_gradingScore, player2_rank, "
-        "player3_level, player3_score, player3_gradingScore, player3_rank, "
-        "player4_level, player4_score, player4_gradingScore, player4_rank "
-        "FROM games" + where
+        "SELECT printf('" + "".join(line_fmt.format(player=i) for i in range(1, 5)) + "', "
+        + ", ".join(fmt_args) + ") FROM games" + where
     )
 
-    # Normalize 4 players into 4 rows
     headers = ["id", "mode", "startTime", "player", "rank", "level", "score", "gradingScore"]
     with open(args.csv, "w", newline="", encoding="utf-8") as f:
-        w = csv.writer(f)
-        w.writerow(headers)
-        for row in conn.execute(sql, params):
-            id_, mode, start_time = row[0], row[1], row[2]
-            # For each player, write a row
-            for i in range(4):
-                level = row[3 + i*4]
-                score = row[4 + i*4]
-                grade = row[5 + i*4]
-                rank = row[6 + i*4]
-                w.writerow([id_, mode, start_time, i+1, rank, level, score, grade])
+        csv.writer(f).writerow(headers)
+        for rows in fetch_batches(conn, sql, params):
+            f.writelines(row[0] for row in rows)
 
 
-def do_compare_levels(conn: sqlite3.Connection, args: argparse.Namespace) -> None:
-    if args.level_a == args.level_b:
-        print("Error: --level-a and --level-b must be different", file=sys.stderr)
-        return
+def sum_compare_levels(conn: sqlite3.Connection, args: argparse.Namespace) -> Tuple[int, int, int, int, int, int]:
+    """Aggregate every (A, B) instance for --level-a/--level-b in SQL. Returns
+    (instances, a_better, b_better, sum_rank_diff, sum_score_diff, sum_grade_diff)."""
+    where, params = where_clause(args)
+    where += (" AND " if where else " WHERE ") + "bucket_a = ? AND bucket_b = ?"
+    params = params + [args.level_a, args.level_b]
+    sql = (
+        "SELECT COUNT(*), "
+        "SUM(CASE WHEN diff_rank < 0 THEN 1 ELSE 0 END), "
+        "SUM(CASE WHEN diff_rank > 0 THEN 1 ELSE 0 END), "
+        "SUM(diff_rank), SUM(diff_score), SUM(diff_grade) "
+        "FROM (" + player_pairs_sql(args.level_bin) + ")" + where
+    )
+    instances, a_better, b_better, sum_rank_diff, sum_score_diff, sum_grade_diff = conn.execute(sql, params).fetchone()
+    if instances == 0:
+        return 0, 0, 0, 0, 0, 0
+    return instances, a_better, b_better, sum_rank_diff, sum_score_diff, sum_grade_diff
 
+
+def write_compare_levels_csv(conn: sqlite3.Connection, args: argparse.Namespace) -> Tuple[int, int, int, int, int, int]:
+    """Write every (A, B) instance for --level-a/--level-b to args.csv, totalling them on the way.
+    Returns the same tuple as sum_compare_levels."""
     where, params = where_clause(args)
+    buckets_sql = ", ".join(bucket_sql(args.level_bin, f"player{i}_level") for i in range(1, 5))
+    # Only fetch games that seat at least one A and one B player
+    where += (" AND " if where else " WHERE ") + f"? IN ({buckets_sql}) AND ? IN ({buckets_sql})"
+    params = params + [args.level_a, args.level_b]
     sql = (
-        "SELECT id, startTime, "
-        "player1_level, player1_score, player1_gradingScore, player1_rank, "
-        "player2_level, player2_score, player2_gradingScore, player2_rank, "
-        "player3_level, player3_score, player3_gradingScore, player3_rank, "
-        "player4_level, player4_score, player4_gradingScore, player4_rank "
-        "FROM games" + where
+        "SELECT id, startTime, " + PLAYER_COLUMNS + ", " + buckets_sql + " FROM games" + where
     )
 
-    # Aggregates
-    instances = 0
-    sum_rank_diff = 0
-    sum_score_diff = 0
-    sum_grade_diff = 0
-    a_better = 0
-    b_better = 0
-    # ties are impossible because ranks are unique (1..4)
-
-    writer = None
-    f = None
-    if args.csv:
-        headers = [
-            "id", "startTime",
-            "playerA", "levelA", "rankA", "scoreA", "gradeA",
-            "playerB", "levelB", "rankB", "scoreB", "gradeB",
-            "diff_rank", "diff_score", "diff_grade"
-        ]
-        f = open(args.csv, "w", newline="", encoding="utf-8")
+    # instances, a_better, b_better, sum_rank_diff, sum_score_diff, sum_grade_diff
+    totals = [0, 0, 0, 0, 0, 0]
+
+    def pair_rows() -> Iterable[List[Any]]:
+        for rows in fetch_batches(conn, sql, params):
+            for row in rows:
+                gid = row[0]
+                st = row[1]
+                # Parallel per-slot lists (index 0..3 = player1..player4)
+                buckets = row[18:22]
+                idx_a = [i for i, b in enumerate(buckets) if b == args.level_a]
+                idx_b = [i for i, b in enumerate(buckets) if b == args.level_b]
+                # INTEGER columns already come back as ints; slice them straight out of the row
+                levels = row[2:18:4]
+                scores = row[3:18:4]
+                grades = row[4:18:4]
+                ranks = row[5:18:4]
+
+                for ia in idx_a:
+                    for ib in idx_b:
+                        diff_rank = ranks[ia] - ranks[ib]
+                        diff_score = scores[ia] - scores[ib]
+                        diff_grade = grades[ia] - grades[ib]
+                        totals[0] += 1
+                        if diff_rank < 0:
+                            totals[1] += 1
+                        elif diff_rank > 0:
+                            totals[2] += 1
+                        totals[3] += diff_rank
+                        totals[4] += diff_score
+                        totals[5] += diff_grade
+                        yield [
+                            gid, st,
+                            ia + 1, levels[ia], ranks[ia], scores[ia], grades[ia],
+                            ib + 1, levels[ib], ranks[ib], scores[ib], grades[ib],
+                            diff_rank, diff_score, diff_grade
+                        ]
+
+    headers = [
+        "id", "startTime",
+        "playerA", "levelA", "rankA", "scoreA", "gradeA",
+        "playerB", "levelB", "rankB", "scoreB", "gradeB",
+        "diff_rank", "diff_score", "diff_grade"
+    ]
+    with open(args.csv, "w", newline="", encoding="utf-8") as f:
         writer = csv.writer(f)
         writer.writerow(headers)
+        writer.writerows(pair_rows())
+    instances, a_better, b_better, sum_rank_diff, sum_score_diff, sum_grade_diff = totals
+    return instances, a_better, b_better, sum_rank_diff, sum_score_diff, sum_grade_diff
 
-    try:
-        for row in conn.execute(sql, params):
-            gid = row[0]
-            st = row[1]
-            # Extract players into a list of dicts for convenience
-            players = []
-            for i in range(4):
-                level = int(row[2 + i*4])
-                score = int(row[3 + i*4])
-                grade = int(row[4 + i*4])
-                rank = int(row[5 + i*4])
-                players.append({
-                    "idx": i+1,
-                    "level": level,
-                    "bucket": bucket_level(level, args.level_bin),
-                    "score": score,
-                    "grade": grade,
-                    "rank": rank,
-                })
-
-            groupA = [p for p in players if p["bucket"] == args.level_a]
-            groupB = [p for p in players if p["bucket"] == args.level_b]
-            if not groupA or not groupB:
-                continue
 
-            for pa in groupA:
-                for pb in groupB:
-                    diff_rank = pa["rank"] - pb["rank"]
-                    diff_score = pa["score"] - pb["score"]
-                    diff_grade = pa["grade"] - pb["grade"]
-                    instances += 1
-                    sum_rank_diff += diff_rank
-                    sum_score_diff += diff_score
-                    sum_grade_diff += diff_grade
-                    if diff_rank < 0:
-                        a_better += 1
-                    elif diff_rank > 0:
-                        b_better += 1
-                    # no tie case since ranks are unique
-                    if writer is not None:
-                        writer.writerow([
-                            gid, st,
-                            pa["idx"], pa["level"], pa["rank"], pa["score"], pa["grade"],
-                            pb["idx"], pb["level"], pb["rank"], pb["score"], pb["grade"],
-                            diff_rank, diff_score, diff_grade
-                        ])
-    finally:
-        if f is not None:
-            f.close()
+def do_compare_levels(conn: sqlite3.Connection, args: argparse.Namespace) -> None:
+    if args.level_a == args.level_b:
+        print("Error: --level-a and --level-b must be different", file=sys.stderr)
+        return
+
+    # The CSV pass already visits every instance, so only aggregate in SQL without it
+    if args.csv:
+        totals = write_compare_levels_csv(conn, args)
+    else:
+        totals = sum_compare_levels(conn, args)
+    instances, a_better, b_better, sum_rank_diff, sum_score_diff, sum_grade_diff = totals
 
     if instances == 0:
         print("No head-to-head instances found for the provided levels and filters.")
@@ -307,74 +332,31 @@ def do_compare_levels(conn: sqlite3.Connection, args: argparse.Namespace) -> Non
     print(f"{args.level_a},{args.level_b},{instances},{a_better},{b_better},{avg_rank_diff:.4f},{avg_score_diff:.2f},{avg_grade_diff:.2f}")
 
 
-def compute_compare_summary(conn: sqlite3.Connection, args: argparse.Namespace, level_a: int, level_b: int) -> Optional[Tuple[int, int, float, float, float, int]]:
-    """Compute head-to-head summary for a given pair of buckets. Returns
-    (instances, a_better, b_better, avg_rank_diff, avg_score_diff, avg_grade_diff)
-    or None if no instances were found."""
-    if level_a == level_b:
-        return None
-
+def compute_compare_summaries(
+    conn: sqlite3.Connection,
+    args: argparse.Namespace,
+) -> Dict[Tuple[int, int], Tuple[int, int, float, float, float, int]]:
+    """Compute head-to-head summaries for every pair of buckets (level_a < level_b)
+    that meet in a game matching the filters, in a single query.
+    Returns {(level_a, level_b): (instances, a_better, avg_rank_diff, avg_score_diff,
+    avg_grade_diff, b_better)}; pairs without instances are omitted."""
     where, params = where_clause(args)
+    where += (" AND " if where else " WHERE ") + "bucket_a < bucket_b"
     sql = (
-        "SELECT id, startTime, "
-        "player1_level, player1_score, player1_gradingScore, player1_rank, "
-        "player2_level, player2_score, player2_gradingScore, player2_rank, "
-        "player3_level, player3_score, player3_gradingScore, player3_rank, "
-        "player4_level, player4_score, player4_gradingScore, player4_rank "
-        "FROM games" + where
+        "SELECT bucket_a, bucket_b, COUNT(*), "
+        "SUM(CASE WHEN diff_rank < 0 THEN 1 ELSE 0 END), "
+        "SUM(CASE WHEN diff_rank > 0 THEN 1 ELSE 0 END), "
+        "SUM(diff_rank), SUM(diff_score), SUM(diff_grade) "
+        "FROM (" + player_pairs_sql(args.level_bin) + ")" + where + " GROUP BY bucket_a, bucket_b"
     )
 
-    instances = 0
-    sum_rank_diff = 0
-    sum_score_diff = 0
-    sum_grade_diff = 0
-    a_better = 0
-    b_better = 0
-    # no ties tracked; ranks are unique
-
-    for row in conn.execute(sql, params):
-        players = []
-        for i in range(4):
-            level = int(row[2 + i*4])
-            score = int(row[3 + i*4])
-            grade = int(row[4 + i*4])
-            rank = int(row[5 + i*4])
-            players.append({
-                "idx": i+1,
-                "level": level,
-                "bucket": bucket_level(level, args.level_bin),
-                "score": score,
-                "grade": grade,
-                "rank": rank,
-            })
-
-        groupA = [p for p in players if p["bucket"] == level_a]
-        groupB = [p for p in players if p["bucket"] == level_b]
-        if not groupA or not groupB:
-            continue
-
-        for pa in groupA:
-            for pb in groupB:
-                diff_rank = pa["rank"] - pb["rank"]
-                diff_score = pa["score"] - pb["score"]
-                diff_grade = pa["grade"] - pb["grade"]
-                instances += 1
-                sum_rank_diff += diff_rank
-                sum_score_diff += diff_score
-                sum_grade_diff += diff_grade
-                if diff_rank < 0:
-                    a_better += 1
-                elif diff_rank > 0:
-                    b_better += 1
-                # no tie branch since ranks are unique
-
-    if instances == 0:
-        return None
-
-    avg_rank_diff = sum_rank_diff / instances
-    avg_score_diff = sum_score_diff / instances
-    avg_grade_diff = sum_grade_diff / instances
-    return (instances, a_better, avg_rank_diff, avg_score_diff, avg_grade_diff, b_better)
+    summaries: Dict[Tuple[int, int], Tuple[int, int, float, float, float, int]] = {}
+    for level_a, level_b, instances, a_better, b_better, sum_rank_diff, sum_score_diff, sum_grade_diff in conn.execute(sql, params):
+        avg_rank_diff = sum_rank_diff / instances
+        avg_score_diff = sum_score_diff / instances
+        avg_grade_diff = sum_grade_diff / instances
+        summaries[(level_a, level_b)] = (instances, a_better, avg_rank_diff, avg_score_diff, avg_grade_diff, b_better)
+    return summaries
 
 
 def do_compare_all(conn: sqlite3.Connection, args: argparse.Namespace) -> None:
@@ -391,29 +373,60 @@ def do_compare_all(conn: sqlite3.Connection, args: argparse.Namespace) -> None:
         w = csv.writer(f)
         w.writerow(["level_a", "level_b", "mode", "instances", "a_better", "b_better", "avg_rank_diff", "avg_score_diff", "avg_grade_diff"])
 
+        summaries_by_mode: Dict[int, Dict[Tuple[int, int], Tuple[int, int, float, float, float, int]]] = {}
         for level_range_a, level_range_b, mode in level_configs:
             print(level_range_a, level_range_b, mode)
-            prev_mode = args.mode
-            args.mode = mode
-            try:
-                for level_a in level_range_a:
-                    for level_b in level_range_b:
-                        if level_a >= level_b:
-                            continue
-                        summary = compute_compare_summary(conn, args, level_a, level_b)
-                        if summary is None:
-                            continue
-                        instances, a_better, avg_rank_diff, avg_score_diff, avg_grade_diff, b_better = summary
-                        w.writerow([level_a, level_b, mode, instances, a_better, b_better,
-                                   f"{avg_rank_diff:.4f}", f"{avg_score_diff:.2f}", f"{avg_grade_diff:.2f}"])
-            finally:
-                args.mode = prev_mode
+            # Several configs share a mode; query (and build the filter for) each mode once
+            summaries = summaries_by_mode.get(mode)
+            if summaries is None:
+                mode_args = argparse.Namespace(**{**vars(args), "mode": mode})
+                summaries = compute_compare_summaries(conn, mode_args)
+                summaries_by_mode[mode] = summaries
+            # Only canonical (level_a < level_b) pairs, in range order
+            pairs = [(a, b) for a, b in itertools.product(level_range_a, level_range_b) if a < b]
+            for level_a, level_b in pairs:
+                summary = summaries.get((level_a, level_b))
+                if summary is None:
+                    continue
+                instances, a_better, avg_rank_diff, avg_score_diff, avg_grade_diff, b_better = summary
+                w.writerow([level_a, level_b, mode, instances, a_better, b_better,
+                           f"{avg_rank_diff:.4f}", f"{avg_score_diff:.2f}", f"{avg_grade_diff:.2f}"])
+
+
+def ensure_indexes(conn: sqlite3.Connection) -> None:
+    """Index the columns every subcommand filters on (mode + startTime window)."""
+    try:
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_games_mode_start ON games(mode, startTime)")
+        conn.execute("PRAGMA optimize")
+        conn.commit()
+    except sqlite3.OperationalError:
+        # Read-only DB or locked file: fall back to table scans
+        pass
+
+
+def configure_read_pragmas(conn: sqlite3.Connection) -> None:
+    """Tune the connection for read-only analytic scans."""
+    for pragma in (
+        "PRAGMA cache_size=-262144",  # 256 MiB page cache
+        "PRAGMA temp_store=MEMORY",
+        "PRAGMA mmap_size=2147483648",
+    ):
+        try:
+            conn.execute(pragma)
+        except sqlite3.DatabaseError:
+            # Older SQLite builds may not support every pragma (e.g. mmap_size)
+            pass
 
 
 def main(argv: Optional[List[str]] = None) -> int:
     args = parse_args(argv)
     try:
         with sqlite3.connect(args.db) as conn:
+            ensure_indexes(conn)
+            configure_read_pragmas(conn)
+            # Temp views must exist before query_only; changing temp_store drops them
+            create_views(conn)
+            conn.execute("PRAGMA query_only=1")
             if args.cmd == "summary":
                 do_summary(conn, args)
             elif args.cmd == "export":
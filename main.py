@@ -29,14 +29,26 @@ Modes (from README):
 from __future__ import annotations
 
 import argparse
+import gzip
+import http.client
 import json
 import sqlite3
 import sys
 import time
+import urllib.error
 import urllib.parse
 import urllib.request
+import zlib
+from concurrent.futures import Future, ThreadPoolExecutor
 from typing import Any, Dict, List, Optional, Tuple
 
+try:
+    # Optional: orjson parses the (bytes) API pages considerably faster than json
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
 BASE_URL = "https://5-data.amae-koromo.com/api/v2/pl4/games/{end}/{start}?{query}"
 
 # Desired column order for schema and inserts: group rank with each player
@@ -48,6 +60,15 @@ INSERT_COLUMNS: List[str] = [
     "player4_level", "player4_score", "player4_gradingScore", "player4_rank",
 ]
 
+_INSERT_SQL = (
+    "INSERT OR IGNORE INTO games (" + ", ".join(INSERT_COLUMNS) + ") "
+    "VALUES (" + ",".join(["?"] * len(INSERT_COLUMNS)) + ")"
+)
+
+# SQLite INTEGER range; sqlite3 raises OverflowError when binding anything outside it
+INT64_MIN = -2**63
+INT64_MAX = 2**63 - 1
+
 
 def now_ms() -> int:
     return int(time.time() * 1000)
@@ -59,7 +80,25 @@ def default_window_ms(days: int = 30) -> Tuple[int, int]:
     return start, end
 
 
+# PRAGMA user_version stamped on a DB once its games table is verified to match INSERT_COLUMNS
+EXPECTED_UV = 1
+
+
 def ensure_schema(conn: sqlite3.Connection) -> None:
+    # Write-oriented connection settings: WAL journal with fewer fsyncs per commit
+    conn.executescript(
+        "PRAGMA journal_mode=WAL;"
+        "PRAGMA synchronous=NORMAL;"
+        "PRAGMA temp_store=MEMORY;"
+        "PRAGMA cache_size=-65536;"
+        "PRAGMA mmap_size=268435456;"
+    )
+
+    # Skip the introspection below if this DB was already verified (by this or an earlier run)
+    (uv,) = conn.execute("PRAGMA user_version").fetchone()
+    if uv == EXPECTED_UV:
+        return
+
     def create_games_with_desired_order() -> None:
         conn.execute(
             """
@@ -92,6 +131,7 @@ def ensure_schema(conn: sqlite3.Connection) -> None:
     row = cur.fetchone()
     if row is None:
         create_games_with_desired_order()
+        conn.execute(f"PRAGMA user_version = {EXPECTED_UV}")
         conn.commit()
         return
 
@@ -101,6 +141,8 @@ def ensure_schema(conn: sqlite3.Connection) -> None:
     current_cols = [r[1] for r in cols_info]
     if current_cols == INSERT_COLUMNS:
         # Already in desired order
+        conn.execute(f"PRAGMA user_version = {EXPECTED_UV}")
+        conn.commit()
         return
 
     # Ensure all required columns exist or can be derived
@@ -163,6 +205,7 @@ def ensure_schema(conn: sqlite3.Connection) -> None:
     )
     conn.execute("DROP TABLE games")
     conn.execute("ALTER TABLE games_new RENAME TO games")
+    conn.execute(f"PRAGMA user_version = {EXPECTED_UV}")
     conn.commit()
 
 
@@ -176,14 +219,73 @@ def build_url(end_ms: int, start_ms: int, mode: int, limit: int = 100000, descen
     return BASE_URL.format(end=end_ms, start=start_ms, query=query)
 
 
-def http_get_json(url: str, timeout: int = 30) -> Any:
-    req = urllib.request.Request(url, headers={
-        "User-Agent": "Mozilla/5.0 (compatible; MahjongSoulRankAnalysis/1.0)",
-        "Accept": "application/json",
-    })
-    with urllib.request.urlopen(req, timeout=timeout) as resp:
+HTTP_HEADERS: Dict[str, str] = {
+    "User-Agent": "Mozilla/5.0 (compatible; MahjongSoulRankAnalysis/1.0)",
+    "Accept": "application/json",
+    # JSON pages compress well; ask for gzip and decode in decode_body
+    "Accept-Encoding": "gzip, deflate",
+}
+
+
+def decode_body(data: bytes, content_encoding: Optional[str]) -> bytes:
+    """Undo gzip/deflate Content-Encoding (urllib and http.client leave it to the caller)."""
+    encoding = (content_encoding or "").strip().lower()
+    if encoding == "gzip":
+        return gzip.decompress(data)
+    if encoding == "deflate":
+        try:
+            return zlib.decompress(data)
+        except zlib.error:
+            # Some servers send raw deflate without the zlib header
+            return zlib.decompress(data, -zlib.MAX_WBITS)
+    return data
+
+
+def open_http_connection(url: str, timeout: int = 30) -> Optional[http.client.HTTPConnection]:
+    """
+    Open a keep-alive connection to the host of `url`, reusable for every page request.
+    Returns None when a proxy applies to it, so callers fall back to urllib (which honours proxies).
+    """
+    parts = urllib.parse.urlsplit(url)
+    if parts.scheme in urllib.request.getproxies() and not urllib.request.proxy_bypass(parts.hostname or ""):
+        return None
+    if parts.scheme == "https":
+        return http.client.HTTPSConnection(parts.netloc, timeout=timeout)
+    return http.client.HTTPConnection(parts.netloc, timeout=timeout)
+
+
+def http_get_json(url: str, timeout: int = 30, http_conn: Optional[http.client.HTTPConnection] = None) -> Any:
+    if http_conn is None:
+        req = urllib.request.Request(url, headers=HTTP_HEADERS)
+        with urllib.request.urlopen(req, timeout=timeout) as resp:
+            data = decode_body(resp.read(), resp.headers.get("Content-Encoding"))
+            return _json_loads(data)
+
+    parts = urllib.parse.urlsplit(url)
+    path = parts.path + ("?" + parts.query if parts.query else "")
+    for attempt in range(2):
+        try:
+            http_conn.request("GET", path, headers=HTTP_HEADERS)
+            resp = http_conn.getresponse()
+        except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+            # The server closed the idle keep-alive socket before answering; resend once on a fresh one
+            http_conn.close()
+            if attempt:
+                raise
+            continue
+        except Exception:
+            # Drop the broken socket; http.client reconnects on the next request
+            http_conn.close()
+            raise
+        break
+    try:
         data = resp.read()
-        return json.loads(data)
+    except Exception:
+        http_conn.close()
+        raise
+    if resp.status >= 400:
+        raise urllib.error.HTTPError(url, resp.status, resp.reason, resp.headers, None)
+    return _json_loads(decode_body(data, resp.headers.get("Content-Encoding")))
 
 
 def to_ms(x: int) -> int:
@@ -206,7 +308,7 @@ def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
                         help="End time in ms since epoch. If omitted while --start-ms is provided, defaults to now. If both are omitted, default behavior is backfill; if DB is empty, uses last 30 days.")
     parser.add_argument("--db", type=str, required=False, default="games.sqlite", help="SQLite database file path")
     parser.add_argument("--limit", type=int, required=False, default=100000, help="API page limit (default 100000)")
-    parser.add_argument("--sleep", type=float, required=False, default=0.5, help="Sleep between pages in seconds")
+    parser.add_argument("--sleep", type=float, required=False, default=0.5, help="Minimum seconds between page requests")
     parser.add_argument("--max-pages", type=int, required=False, default=0,
                         help="Optional cap on number of pages to fetch (0 = no cap)")
     parser.add_argument("--recent", type=int, required=False, default=0,
@@ -217,118 +319,184 @@ def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
 
 def extract_row(game: Dict[str, Any], mode_override: Optional[int] = None) -> Optional[Tuple[Any, ...]]:
     try:
-        gid = game.get("_id") or game.get("uuid")
-        if not gid:
+        g_get = game.get
+        gid = g_get("_id") or g_get("uuid")
+        # Only ids sqlite3 can bind; anything else (e.g. {"$oid": ...}) is an invalid record
+        if not gid or not isinstance(gid, (str, int)) or (isinstance(gid, int) and not INT64_MIN <= gid <= INT64_MAX):
             return None
-        mode = int(game.get("modeId")) if game.get("modeId") is not None else (mode_override if mode_override is not None else None)
+        mode_id = g_get("modeId")
+        mode = int(mode_id) if mode_id is not None else mode_override
         if mode is None:
             return None
         # Use startTime from API (seconds). Fall back to endTime if missing.
-        start_time_sec = int(game.get("startTime") if game.get("startTime") is not None else game["endTime"])  # seconds
-        players = game.get("players") or []
+        st = g_get("startTime")
+        start_time_sec = int(st if st is not None else game["endTime"])  # seconds
+        players = g_get("players") or []
         if len(players) != 4:
             return None
-        # Extract metrics in order
-        levels: List[int] = []
-        scores: List[int] = []
-        grades: List[int] = []
-        for i in range(4):
-            p = players[i]
-            levels.append(int(p.get("level", 0)))
-            scores.append(int(p.get("score", 0)))
-            grades.append(int(p.get("gradingScore", 0)))
+        # Extract metrics in order, one dict probe per field
+        p0, p1, p2, p3 = players
+        p_get = p0.get
+        level0, score0, grade0 = int(p_get("level", 0)), int(p_get("score", 0)), int(p_get("gradingScore", 0))
+        p_get = p1.get
+        level1, score1, grade1 = int(p_get("level", 0)), int(p_get("score", 0)), int(p_get("gradingScore", 0))
+        p_get = p2.get
+        level2, score2, grade2 = int(p_get("level", 0)), int(p_get("score", 0)), int(p_get("gradingScore", 0))
+        p_get = p3.get
+        level3, score3, grade3 = int(p_get("level", 0)), int(p_get("score", 0)), int(p_get("gradingScore", 0))
+        # JSON ints are unbounded; reject the record rather than fail the whole page's insert
+        ints = (mode, start_time_sec, level0, score0, grade0, level1, score1, grade1,
+                level2, score2, grade2, level3, score3, grade3)
+        if min(ints) < INT64_MIN or max(ints) > INT64_MAX:
+            return None
 
         # Compute placement ranks 1..4 by score desc.
         # Tie-break ONLY by original order (earlier index = higher rank).
         # This intentionally ignores gradingScore and accountId for tiebreaks.
-        tie_keys: List[Tuple[int, int]] = []
-        for i in range(4):
-            tie_keys.append((-scores[i], i))
-        order = sorted(range(4), key=lambda i: tie_keys[i])
-        ranks = [0, 0, 0, 0]
-        for pos, idx in enumerate(order):
-            ranks[idx] = pos + 1
-
-        vals: List[int] = [
-            levels[0], scores[0], grades[0], ranks[0],
-            levels[1], scores[1], grades[1], ranks[1],
-            levels[2], scores[2], grades[2], ranks[2],
-            levels[3], scores[3], grades[3], ranks[3],
-        ]
+        # Same formula as rank_expr in ensure_schema: 1 + #higher scores + #equal scores seated earlier.
+        rank0 = 1 + (score1 > score0) + (score2 > score0) + (score3 > score0)
+        rank1 = 1 + (score0 >= score1) + (score2 > score1) + (score3 > score1)
+        rank2 = 1 + (score0 >= score2) + (score1 >= score2) + (score3 > score2)
+        rank3 = 1 + (score0 >= score3) + (score1 >= score3) + (score2 >= score3)
+
         return (
             gid,
             mode,
             start_time_sec,
-            *vals,
+            level0, score0, grade0, rank0,
+            level1, score1, grade1, rank1,
+            level2, score2, grade2, rank2,
+            level3, score3, grade3, rank3,
         )
     except Exception:
         return None
 
 
-def insert_games(
-    conn: sqlite3.Connection,
+def describe_invalid(game: Dict[str, Any], mode_override: Optional[int]) -> str:
+    """Best-effort reason why extract_row rejected a record (for verbose logging)."""
+    gid = game.get("_id") or game.get("uuid")
+    players = game.get("players")
+    reason = []
+    if not gid:
+        reason.append("no id")
+    elif not isinstance(gid, (str, int)):
+        reason.append(f"unsupported id type {type(gid).__name__}")
+    fields = [gid, game.get("modeId"), game.get("startTime"), game.get("endTime")]
+    if isinstance(players, list):
+        for p in players:
+            if isinstance(p, dict):
+                fields += [p.get("level"), p.get("score"), p.get("gradingScore")]
+    if any(isinstance(v, (int, float)) and not INT64_MIN <= v <= INT64_MAX for v in fields):
+        reason.append("integer outside SQLite's 64-bit range")
+    if not isinstance(players, list) or len(players) != 4:
+        reason.append(f"players count != 4 (got {len(players) if isinstance(players, list) else 'non-list'})")
+    mode_val = game.get("modeId")
+    if mode_val is None and mode_override is None:
+        reason.append("no modeId and no override")
+    return ", ".join(reason) if reason else "unknown"
+
+
+def _extract_rows(games: List[Dict[str, Any]], mode_override: Optional[int]) -> List[Tuple[Any, ...]]:
+    """Valid rows of a page, in order."""
+    return [row for row in (extract_row(g, mode_override=mode_override) for g in games) if row is not None]
+
+
+def _extract_rows_verbose(games: List[Dict[str, Any]], mode_override: Optional[int]) -> List[Tuple[Any, ...]]:
+    """Same as _extract_rows, logging every record."""
+    rows: List[Tuple[Any, ...]] = []
+    for idx, g in enumerate(games, start=1):
+        row = extract_row(g, mode_override=mode_override)
+        if row is None:
+            print(f"  [skip rec {idx}] invalid row: {describe_invalid(g, mode_override)}")
+            continue
+        players = g.get("players")
+        print(f"  [rec {idx}] players={len(players)} row_len={len(row)} id={row[0]}")
+        rows.append(row)
+    return rows
+
+
+def _page_candidates(
     games: List[Dict[str, Any]],
-    mode_override: Optional[int] = None,
-    verbose: bool = False,
-) -> Tuple[int, int]:
-    placeholders = ",".join(["?"] * len(INSERT_COLUMNS))
-    sql = (
-        "INSERT OR IGNORE INTO games (" + ", ".join(INSERT_COLUMNS) + ") "
-        f"VALUES ({placeholders})"
-    )
-    ok = 0
-    skipped = 0
-    cur = conn.cursor()
+    mode_override: Optional[int],
+    seen_ids: set[str],
+) -> List[Tuple[int, Tuple[Any, ...]]]:
+    """(1-based position, row) for each valid record whose id was not seen earlier in the run or page."""
+    candidates: List[Tuple[int, Tuple[Any, ...]]] = []
+    page_seen: set[str] = set()
     for idx, g in enumerate(games, start=1):
+        gid = g.get("_id") or g.get("uuid")
+        if isinstance(gid, (str, int)) and (gid in seen_ids or gid in page_seen):
+            continue
         row = extract_row(g, mode_override=mode_override)
-        if verbose and row is not None:
-            try:
-                players = g.get("players")
-                print(f"  [rec {idx}] players={len(players) if isinstance(players, list) else 'non-list'} row_len={len(row)} id={g.get('_id') or g.get('uuid')}")
-            except Exception:
-                pass
         if row is None:
-            if verbose:
-                # Try to identify reason
-                gid = g.get("_id") or g.get("uuid")
-                players = g.get("players")
-                reason = []
-                if not gid:
-                    reason.append("no id")
-                if not isinstance(players, list) or len(players) != 4:
-                    reason.append(f"players count != 4 (got {len(players) if isinstance(players, list) else 'non-list'})")
-                mode_val = g.get("modeId")
-                if mode_val is None and mode_override is None:
-                    reason.append("no modeId and no override")
-                print(f"  [skip rec {idx}] invalid row: {', '.join(reason) if reason else 'unknown'}")
-            skipped += 1
             continue
-        try:
-            cur.execute(sql, row)
-            if cur.rowcount > 0:
-                ok += 1
-            else:
-                if verbose:
-                    gid = g.get("_id") or g.get("uuid")
-                    print(f"  [skip rec {idx}] duplicate (id={gid})")
-                skipped += 1
-        except sqlite3.IntegrityError:
-            # Duplicate primary key
-            if verbose:
-                gid = g.get("_id") or g.get("uuid")
-                print(f"  [skip rec {idx}] IntegrityError duplicate (id={gid})")
-            skipped += 1
-        except Exception as e:
-            if verbose:
-                gid = g.get("_id") or g.get("uuid")
-                print(f"  [skip rec {idx}] exception during insert (id={gid}): {e}")
-            skipped += 1
-    conn.commit()
-    return ok, skipped
+        page_seen.add(gid)
+        candidates.append((idx, row))
+    return candidates
+
+
+def _page_candidates_verbose(
+    games: List[Dict[str, Any]],
+    mode_override: Optional[int],
+    seen_ids: set[str],
+) -> List[Tuple[int, Tuple[Any, ...]]]:
+    """Same as _page_candidates, logging every record."""
+    candidates: List[Tuple[int, Tuple[Any, ...]]] = []
+    page_seen: set[str] = set()
+    for idx, g in enumerate(games, start=1):
+        gid = g.get("_id") or g.get("uuid")
+        if isinstance(gid, (str, int)) and (gid in seen_ids or gid in page_seen):
+            print(f"  [skip rec {idx}] already seen in this run (id={gid})")
+            continue
+        row = extract_row(g, mode_override=mode_override)
+        if row is None:
+            print(f"  [skip rec {idx}] invalid row: {describe_invalid(g, mode_override)}")
+            continue
+        players = g.get("players")
+        print(f"  [rec {idx}] players={len(players)} row_len={len(row)} id={gid}")
+        page_seen.add(gid)
+        candidates.append((idx, row))
+    return candidates
+
+
+def insert_games(
+    cur: sqlite3.Cursor,
+    games: List[Dict[str, Any]],
+    mode_override: Optional[int] = None,
+    verbose: bool = False,
+    seen_ids: Optional[set[str]] = None,
+) -> Tuple[int, int]:
+    # Pick the record pass once; the fast one has no per-record logging branches
+    extract = _extract_rows_verbose if verbose else _extract_rows
+    rows = extract(games, mode_override)
+    if seen_ids is not None:
+        # Drop ids already handled earlier in this run (page overlaps, repeats) before touching SQLite
+        fresh: List[Tuple[Any, ...]] = []
+        for row in rows:
+            if row[0] not in seen_ids:
+                seen_ids.add(row[0])
+                fresh.append(row)
+        if verbose and len(fresh) < len(rows):
+            print(f"  [skip] {len(rows) - len(fresh)} already seen in this run")
+        rows = fresh
+    skipped = len(games) - len(rows)
+
+    if not rows:
+        return 0, skipped
+
+    # Insert the whole page in one transaction; OR IGNORE drops ids already in the DB
+    with cur.connection:
+        cur.execute("BEGIN")
+        cur.executemany(_INSERT_SQL, rows)
+    ok = cur.rowcount
+    duplicates = len(rows) - ok
+    if verbose and duplicates:
+        print(f"  [skip] {duplicates} duplicate(s) already in DB")
+    return ok, skipped + duplicates
 
 
 def insert_games_capped(
-    conn: sqlite3.Connection,
+    cur: sqlite3.Cursor,
     games: List[Dict[str, Any]],
     mode_override: Optional[int],
     remaining: int,
@@ -343,76 +511,66 @@ def insert_games_capped(
     - reached_cap: True if remaining reached 0 during this page
     - processed: number of items from `games` list we consumed
     """
-    placeholders = ",".join(["?"] * len(INSERT_COLUMNS))
-    sql = (
-        "INSERT OR IGNORE INTO games (" + ", ".join(INSERT_COLUMNS) + ") "
-        f"VALUES ({placeholders})"
-    )
+    local_seen = seen_ids if seen_ids is not None else set()
+
+    # Pre-pass: extract valid rows not yet seen in this run, remembering their position in `games`
+    collect = _page_candidates_verbose if verbose else _page_candidates
+    candidates = collect(games, mode_override, local_seen)
+
+    # Insert in slices of exactly `remaining` rows so the cap can only be hit on a slice
+    # boundary; OR IGNORE duplicates shrink rowcount and roll over into the next slice.
     inserted = 0
-    skipped = 0
-    processed = 0
     cap_reached = False
-    cur = conn.cursor()
-    local_seen = seen_ids if seen_ids is not None else set()
+    processed = len(games)
+    pos = 0
+    with cur.connection:
+        cur.execute("BEGIN")
+        while pos < len(candidates) and remaining > 0:
+            batch = candidates[pos:pos + remaining]
+            cur.executemany(_INSERT_SQL, [row for _, row in batch])
+            pos += len(batch)
+            inserted += cur.rowcount
+            remaining -= cur.rowcount
+            if remaining <= 0:
+                cap_reached = True
+                processed = batch[-1][0]
+                break
 
-    for idx, g in enumerate(games, start=1):
-        processed += 1
-        gid = g.get("_id") or g.get("uuid")
-        if gid is not None and gid in local_seen:
-            if verbose:
-                print(f"  [skip rec {idx}] already seen in this run (id={gid})")
-            skipped += 1
-            continue
-        row = extract_row(g, mode_override=mode_override)
-        if verbose and row is not None:
-            try:
-                players = g.get("players")
-                print(f"  [rec {idx}] players={len(players) if isinstance(players, list) else 'non-list'} row_len={len(row)} id={gid}")
-            except Exception:
-                pass
-        if row is None:
-            if verbose:
-                players = g.get("players")
-                reason = []
-                if not gid:
-                    reason.append("no id")
-                if not isinstance(players, list) or len(players) != 4:
-                    reason.append(f"players count != 4 (got {len(players) if isinstance(players, list) else 'non-list'})")
-                mode_val = g.get("modeId")
-                if mode_val is None and mode_override is None:
-                    reason.append("no modeId and no override")
-                print(f"  [skip rec {idx}] invalid row: {', '.join(reason) if reason else 'unknown'}")
-            skipped += 1
-            continue
-        try:
-            cur.execute(sql, row)
-            if gid is not None:
-                local_seen.add(gid)
-            # Count only successful insertions (new rows). If OR IGNORE ignored due to dup,
-            # the rowcount may be 0; treat as skipped.
-            if cur.rowcount > 0:
-                inserted += 1
-                remaining -= 1
-                if remaining <= 0:
-                    cap_reached = True
-                    break
-            else:
-                if verbose:
-                    print(f"  [skip rec {idx}] duplicate (id={gid})")
-                skipped += 1
-        except sqlite3.IntegrityError:
-            if verbose:
-                print(f"  [skip rec {idx}] IntegrityError duplicate (id={gid})")
-            skipped += 1
-        except Exception as e:
-            if verbose:
-                print(f"  [skip rec {idx}] exception during insert (id={gid}): {e}")
-            skipped += 1
+    local_seen.update(row[0] for _, row in candidates[:pos])
+    if verbose and pos > inserted:
+        print(f"  [skip] {pos - inserted} duplicate(s) already in DB")
 
-    conn.commit()
+    # Every processed record was either inserted or skipped (invalid, seen, duplicate)
+    skipped = processed - inserted
     return inserted, skipped, cap_reached, processed
 
 
+def fetch_page(
+    url: str,
+    http_conn: Optional[http.client.HTTPConnection],
+    sleep_s: float,
+    not_before: float = 0.0,
+) -> Optional[Any]:
+    """
+    Fetch one API page, retrying once after a short backoff. Waits until time.monotonic()
+    reaches `not_before` so requests stay rate limited. Returns None if both attempts fail.
+    """
+    wait = not_before - time.monotonic()
+    if wait > 0:
+        time.sleep(wait)
+    try:
+        return http_get_json(url, http_conn=http_conn)
+    except Exception as e:
+        print(f"Request failed: {e}", file=sys.stderr)
+        # Backoff and retry once quickly; if fails again, give up on this page
+        time.sleep(min(2.0, sleep_s))
+        try:
+            return http_get_json(url, http_conn=http_conn)
+        except Exception as e2:
+            print(f"Retry failed: {e2}", file=sys.stderr)
+            return None
+
+
 def fetch_and_store(
     db_path: str,
     mode: int,
@@ -424,46 +582,111 @@ def fetch_and_store(
     recent_count: int = 0,
     verbose: bool = False,
 ) -> None:
-    with sqlite3.connect(db_path) as conn:
+    with sqlite3.connect(db_path) as conn, ThreadPoolExecutor(max_workers=1) as pool:
+        # Autocommit mode: transactions are opened explicitly with BEGIN around each page insert
+        conn.isolation_level = None
         ensure_schema(conn)
+        # One cursor for the whole run; the insert statement stays prepared across pages
+        cur = conn.cursor()
         pages = 0
         total_inserted = 0
         current_end = end_ms
-        seen_ids: set[str] = set()
+        # Ids handled on the previous page. Pages only overlap their neighbour, so older ids are
+        # dropped instead of growing for the whole run; INSERT OR IGNORE still rejects any repeat.
+        prev_ids: set[str] = set()
+        # One keep-alive connection for every page instead of a new TCP/TLS handshake each time.
+        # Only the single pool worker ever uses it. None when a proxy is configured (urllib handles those).
+        http_conn = open_http_connection(BASE_URL)
+        # Next page request, submitted before the current page is inserted so network and disk overlap
+        pending: Optional[Future] = None
+        # Requests start at least sleep_s apart; time spent waiting on the server counts towards it
+        next_request_at = 0.0
+
+        def submit_fetch(url: str) -> Future:
+            nonlocal next_request_at
+            # The worker is idle whenever we submit, so the request starts at the later of the two
+            started = max(time.monotonic(), next_request_at)
+            next_request_at = started + sleep_s
+            return pool.submit(fetch_page, url, http_conn, sleep_s, started)
 
         while current_end >= start_ms:
-            # Adjust per-page limit if we're in recent mode
-            page_limit = limit
-            if recent_count and recent_count > 0:
-                remaining = max(0, recent_count - total_inserted)
-                if remaining <= 0:
-                    print("Target reached; stopping.")
-                    break
-                page_limit = min(limit, remaining)
+            if pending is None:
+                # Adjust per-page limit if we're in recent mode
+                page_limit = limit
+                if recent_count and recent_count > 0:
+                    remaining = max(0, recent_count - total_inserted)
+                    if remaining <= 0:
+                        print("Target reached; stopping.")
+                        break
+                    page_limit = min(limit, remaining)
+
+                url = build_url(end_ms=current_end, start_ms=start_ms, mode=mode, limit=page_limit, descending=True)
+                if verbose:
+                    print(f"Fetching: {url}")
+                pending = submit_fetch(url)
 
-            url = build_url(end_ms=current_end, start_ms=start_ms, mode=mode, limit=page_limit, descending=True)
-            if verbose:
-                print(f"Fetching: {url}")
-            try:
-                data = http_get_json(url)
-            except Exception as e:
-                print(f"Request failed: {e}", file=sys.stderr)
-                # Backoff and retry once quickly; if fails again, break this page
-                time.sleep(min(2.0, sleep_s))
-                try:
-                    data = http_get_json(url)
-                except Exception as e2:
-                    print(f"Retry failed: {e2}", file=sys.stderr)
-                    break
+            data = pending.result()
+            pending = None
+            if data is None:
+                break
 
             if not isinstance(data, list) or len(data) == 0:
                 print("No more data returned; stopping.")
                 break
 
+            # Determine next end_ms from oldest startTime in this page, convert to ms and move back.
+            # Pages are requested with descending=true, so the oldest game is the last one.
+            stop_message: Optional[str] = None
+            next_end_ms = current_end
+            last = data[-1]
+            oldest_start_sec: Optional[int] = None
+            if isinstance(last, dict):
+                st = last.get("startTime")
+                try:
+                    oldest_start_sec = int(st if st is not None else last.get("endTime", 0))
+                except (TypeError, ValueError):
+                    pass
+            if oldest_start_sec is None:
+                # If something odd, stop after storing this page
+                stop_message = "Could not determine oldest startTime; stopping."
+            else:
+                next_end_ms = to_ms(oldest_start_sec) - 1
+                if verbose:
+                    print(
+                        f"Boundary: oldest_start_sec={oldest_start_sec}, current_end_ms={current_end} -> proposed next_end_ms={next_end_ms}"
+                    )
+
+                # Progress guard: if boundary didn't move to an earlier second, force a 1s step back
+                current_end_sec = to_seconds(current_end)
+                proposed_end_sec = to_seconds(next_end_ms)
+                if proposed_end_sec >= current_end_sec:
+                    fallback_next = current_end_sec * 1000 - 1000
+                    if fallback_next >= current_end:
+                        fallback_next = current_end - 1000  # ensure movement
+                    if verbose:
+                        print(
+                            f"No boundary progress (proposed {proposed_end_sec} >= current {current_end_sec}). Fallback next_end_ms={fallback_next}"
+                        )
+                    next_end_ms = fallback_next
+
+                if next_end_ms < start_ms:
+                    stop_message = "Reached start boundary; stopping."
+                elif max_pages and pages + 1 >= max_pages:
+                    stop_message = "Max pages reached; stopping."
+
+            # Prefetch the next page while this one is inserted. Recent mode sizes each page by
+            # what is still missing after the insert, so it stays sequential.
+            if stop_message is None and not (recent_count and recent_count > 0):
+                url = build_url(end_ms=next_end_ms, start_ms=start_ms, mode=mode, limit=limit, descending=True)
+                if verbose:
+                    print(f"Fetching: {url}")
+                pending = submit_fetch(url)
+
+            seen_ids = set(prev_ids)
             if recent_count and recent_count > 0:
                 remaining = max(0, recent_count - total_inserted)
                 inserted, skipped, cap, processed = insert_games_capped(
-                    conn, data, mode_override=mode, remaining=remaining, seen_ids=seen_ids, verbose=verbose
+                    cur, data, mode_override=mode, remaining=remaining, seen_ids=seen_ids, verbose=verbose
                 )
                 total_inserted += inserted
                 pages += 1
@@ -475,7 +698,7 @@ def fetch_and_store(
                     print("Reached requested recent count; stopping.")
                     break
             else:
-                inserted, skipped = insert_games(conn, data, mode_override=mode, verbose=verbose)
+                inserted, skipped = insert_games(cur, data, mode_override=mode, verbose=verbose, seen_ids=seen_ids)
                 total_inserted += inserted
                 pages += 1
                 if verbose:
@@ -483,47 +706,14 @@ def fetch_and_store(
                         f"Page {pages}: received {len(data)} records -> inserted {inserted}, skipped {skipped}. Total inserted: {total_inserted}"
                     )
 
-            # Determine next end_ms from oldest startTime in this page, convert to ms and move back.
-            try:
-                oldest_start_sec = min(
-                    int((g.get("startTime") if g.get("startTime") is not None else g.get("endTime", 0)))
-                    for g in data if isinstance(g, dict)
-                )
-            except ValueError:
-                # If something odd, break out
-                print("Could not determine oldest startTime; stopping.")
-                break
-            next_end_ms = to_ms(oldest_start_sec) - 1
-            if verbose:
-                print(
-                    f"Boundary: oldest_start_sec={oldest_start_sec}, current_end_ms={current_end} -> proposed next_end_ms={next_end_ms}"
-                )
-
-            # Progress guard: if boundary didn't move to an earlier second, force a 1s step back
-            current_end_sec = to_seconds(current_end)
-            proposed_end_sec = to_seconds(next_end_ms)
-            if proposed_end_sec >= current_end_sec:
-                fallback_next = current_end_sec * 1000 - 1000
-                if fallback_next >= current_end:
-                    fallback_next = current_end - 1000  # ensure movement
-                if verbose:
-                    print(
-                        f"No boundary progress (proposed {proposed_end_sec} >= current {current_end_sec}). Fallback next_end_ms={fallback_next}"
-                    )
-                next_end_ms = fallback_next
-
-            if next_end_ms < start_ms:
-                print("Reached start boundary; stopping.")
+            if stop_message is not None:
+                print(stop_message)
                 break
             current_end = next_end_ms
+            prev_ids = seen_ids - prev_ids
 
-            if max_pages and pages >= max_pages:
-                print("Max pages reached; stopping.")
-                break
-
-            if sleep_s > 0:
-                time.sleep(sleep_s)
-
+        if http_conn is not None:
+            http_conn.close()
         print(f"Done. Pages: {pages}, total inserted: {total_inserted}")
 
 